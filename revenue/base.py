@@ -1,11 +1,39 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional, List, Any, Dict
-import uuid
-import re
+from typing import Optional, List, Any, Dict, Deque
+from collections import deque
+import os
+import sys
 import json
+import time
+
+# add_log zaman damgası saniye çözünürlüğünde önbelleğe alınır
+_LAST_TS_SEC = 0
+_LAST_TS_PREFIX = ""
+_LOG_CAPACITY = 64
+
+_VALID_STATUSES = frozenset({
+    "pending", "processing", "completed",
+    "failed", "on_hold", "cancelled", "refunded"
+})
+_PAYABLE_STATUSES = frozenset({"pending", "on_hold"})
+
+# TYPE_CODE sırasıyla rapor gelir türleri; 3 numaralı kova tanımsız türler içindir
+REVENUE_KINDS = ("AdRevenue", "Membership", "Sponsorship", None)
+
+# json.dumps varsayılan dışı parametrelerle her çağrıda yeni encoder kurar
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
 
 class PaymentBase(ABC):
+    __slots__ = (
+        "_payment_id", "_created_at", "_updated_at",
+        "_channel_id", "_amount", "_currency", "_period", "_status",
+        "_logs", "_metadata", "_priority_level", "_cached_tax", "_observers"
+    )
+
+    # Raporlardaki gelir türü; REVENUE_KINDS içindeki sıra, alt sınıflar kendi kodunu tanımlar
+    TYPE_CODE: int = 3
+
     def __init__(
         self, 
         channel_id: str, 
@@ -14,9 +42,11 @@ class PaymentBase(ABC):
         period: str, 
         status: str = "pending"
     ):
-        self._payment_id: str = str(uuid.uuid4())
-        self._created_at: datetime = datetime.now()
-        self._updated_at: datetime = datetime.now()
+        self._payment_id: str = os.urandom(16).hex()
+        now = datetime.now()
+        self._created_at: datetime = now
+        self._updated_at: datetime = now
+        self._logs: Deque[str] = deque(maxlen=_LOG_CAPACITY)
         
         self._channel_id = self._validate_channel_format(channel_id)
         self._amount = self._validate_amount_initial(amount)
@@ -24,8 +54,10 @@ class PaymentBase(ABC):
         self._period = self._validate_period_regex(period)
         self._status = status
         
-        self._logs: List[str] = []
         self._metadata: Dict[str, Any] = {}
+        self._cached_tax: Optional[float] = None
+        # Ödemeyi tutan repository'ler; tutar ve statü değişiklikleri hepsine bildirilir
+        self._observers: List[Any] = []
         self._priority_level: int = self._calculate_initial_priority()
         
         self.add_log(f"Ödeme başlatıldı. ID: {self._payment_id}")
@@ -46,17 +78,22 @@ class PaymentBase(ABC):
     
     @amount.setter
     def amount(self, value: float):
-        if not isinstance(value, (int, float)):
-            raise TypeError("Tutar sayısal bir değer olmalıdır.")
+        # Tam float/int için isinstance atlanır; diğer tipler eski kontrolden geçer
+        if type(value) is not float and type(value) is not int:
+            if not isinstance(value, (int, float)):
+                raise TypeError("Tutar sayısal bir değer olmalıdır.")
         if value < 0:
             raise ValueError("Tutar negatif olamaz.")
         
-        if value > 50000:
-            self.add_log(f"Yüksek tutar uyarısı: {value}")
+        if value > 50000 and self._priority_level != 1:
             self._priority_level = 1
+            self.add_log(f"Yüksek tutar uyarısı: {value}")
             
         self._amount = float(value)
+        self._invalidate_cache()
         self._updated_at = datetime.now()
+        for observer in self._observers:
+            observer.payment_amount_changed(self)
 
     @property
     def currency(self) -> str:
@@ -72,16 +109,42 @@ class PaymentBase(ABC):
 
     @status.setter
     def status(self, new_status: str):
-        valid_statuses = [
-            "pending", "processing", "completed", 
-            "failed", "on_hold", "cancelled", "refunded"
-        ]
-        if new_status not in valid_statuses:
+        if new_status not in _VALID_STATUSES:
             raise ValueError(f"Geçersiz durum: {new_status}")
         
         self._status = new_status
         self._updated_at = datetime.now()
         self.add_log(f"Durum değişti: {new_status}")
+        for observer in self._observers:
+            observer.payment_status_changed(self)
+
+    def add_observer(self, observer: Any):
+        if not any(o is observer for o in self._observers):
+            self._observers.append(observer)
+
+    def remove_observer(self, observer: Any):
+        self._observers = [o for o in self._observers if o is not observer]
+
+    def __getstate__(self):
+        # Kopyalama/serileştirme ödemeyi tutan repository'leri beraberinde taşımaz
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state["_observers"] = []
+        return None, state
+
+    def __setstate__(self, state):
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def is_valid_status(status: str) -> bool:
+        return status in _VALID_STATUSES
+
+    def _invalidate_cache(self):
+        self._cached_tax = None
 
     def _calculate_initial_priority(self) -> int:
         if self._amount > 100000:
@@ -109,19 +172,28 @@ class PaymentBase(ABC):
         return code.upper()
 
     def _validate_period_regex(self, p_str: str) -> str:
-        pattern = r"^\d{4}-(0[1-9]|1[0-2])$"
-        if not re.match(pattern, p_str):
-            current_period = datetime.now().strftime("%Y-%m")
-            self.add_log(f"Geçersiz dönem formatı ({p_str}). {current_period} atandı.")
-            return current_period
-        return p_str
+        # Dönemler az sayıda tekrar eden değerdir; intern edilince indeks anahtarı
+        # karşılaştırmaları kimlik kontrolüyle sonuçlanır
+        if len(p_str) == 7 and p_str[4] == "-" and p_str[:4].isdecimal():
+            onlar, birler = p_str[5], p_str[6]
+            if "0" <= onlar <= "1" and "0" <= birler <= "9":
+                ay = (ord(onlar) - 48) * 10 + (ord(birler) - 48)
+                if 1 <= ay <= 12:
+                    return sys.intern(p_str)
+        current_period = sys.intern(datetime.now().strftime("%Y-%m"))
+        self.add_log(f"Geçersiz dönem formatı ({p_str}). {current_period} atandı.")
+        return current_period
 
     def add_log(self, message: str):
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self._logs.append(f"[{ts}] {message}")
+        global _LAST_TS_SEC, _LAST_TS_PREFIX
+        sec = int(time.time())
+        if sec != _LAST_TS_SEC:
+            _LAST_TS_SEC = sec
+            _LAST_TS_PREFIX = f"[{datetime.fromtimestamp(sec).strftime('%Y-%m-%d %H:%M:%S')}] "
+        self._logs.append(_LAST_TS_PREFIX + message)
 
     def get_logs(self) -> List[str]:
-        return self._logs
+        return list(self._logs)
 
     def to_json(self) -> str:
         data = {
@@ -133,10 +205,10 @@ class PaymentBase(ABC):
             "priority": self._priority_level,
             "created_at": self._created_at.isoformat()
         }
-        return json.dumps(data, ensure_ascii=False)
+        return _JSON_ENCODER.encode(data)
 
     def is_payable(self) -> bool:
-        return self._status in ["pending", "on_hold"] and self._amount > 0
+        return self._status in _PAYABLE_STATUSES and self._amount > 0
 
     @abstractmethod
     def calculate_tax(self) -> float:
@@ -1,7 +1,4 @@
-import time
 import random
-from datetime import datetime, timedelta
-from typing import List
 from .base import PaymentBase
 from .implementations import (AdRevenuePayment, MembershipRevenuePayment, SponsorshipPayment)
 from .repository import InMemoryPaymentRepository
@@ -20,73 +17,90 @@ def create_dummy_data(service: RevenueService, count: int = 50):
     periods = ["2025-01", "2025-02", "2025-03"]
     platforms = ["Google AdSense", "Facebook Ads", "Unity Ads"]
     
-    success_cnt = 0
-    fail_cnt = 0
+    # Sayısal alanlar döngüden önce toplu üretilir; random.random C seviyesinde
+    # çalıştığı için randint/uniform sarmalayıcılarından daha ucuzdur.
+    rastgele = random.random
+    impressions_list = [1000 + int(rastgele() * 499001) for _ in range(count)]
+    cpm_list = [5.0 + rastgele() * 45.0 for _ in range(count)]
+    subscribers_list = [10 + int(rastgele() * 4991) for _ in range(count)]
+    sponsor_amount_list = [5000.0 + rastgele() * 95000.0 for _ in range(count)]
+
+    channel_list = random.choices(channels, k=count)
+    period_list = random.choices(periods, k=count)
+    currency_list = random.choices(currencies, k=count)
+    platform_list = random.choices(platforms, k=count)
+
+    def build_ad(i: int, channel: str, period: str, currency: str) -> PaymentBase:
+        impressions = impressions_list[i]
+        cpm = cpm_list[i]
+        amount = (impressions / 1000) * cpm
+        
+        return AdRevenuePayment(
+            channel_id=channel,
+            amount=amount,
+            currency=currency,
+            period=period,
+            ad_impressions=impressions,
+            cpm_rate=cpm,
+            ad_platform=platform_list[i]
+        )
 
-    for _ in range(count):
-        p_type = random.choice(["ad", "member", "sponsor"])
-        channel = random.choice(channels)
-        period = random.choice(periods)
-        currency = random.choice(currencies)
+    def build_member(i: int, channel: str, period: str, currency: str) -> PaymentBase:
+        subscribers = subscribers_list[i]
+        amount = subscribers * 15.0 
+        gold_cnt = int(subscribers * 0.1)
+        silver_cnt = subscribers - gold_cnt
         
-        payment = None
+        return MembershipRevenuePayment(
+            channel_id=channel,
+            amount=amount,
+            currency=currency,
+            period=period,
+            total_subscribers=subscribers,
+            tier_breakdown={"Gold": gold_cnt, "Silver": silver_cnt}
+        )
+
+    def build_sponsor(i: int, channel: str, period: str, currency: str) -> PaymentBase:
+        amount = sponsor_amount_list[i]
+        contract = f"CNT-{random.randint(1000,9999)}"
         
-        try:
-            if p_type == "ad":
-                impressions = random.randint(1000, 500000)
-                cpm = random.uniform(5.0, 50.0) 
-                amount = (impressions / 1000) * cpm
-                
-                payment = AdRevenuePayment(
-                    channel_id=channel,
-                    amount=amount,
-                    currency=currency,
-                    period=period,
-                    ad_impressions=impressions,
-                    cpm_rate=cpm,
-                    ad_platform=random.choice(platforms)
-                )
-                
-            elif p_type == "member":
-                subscribers = random.randint(10, 5000)
-                amount = subscribers * 15.0 
-                gold_cnt = int(subscribers * 0.1)
-                silver_cnt = subscribers - gold_cnt
-                
-                payment = MembershipRevenuePayment(
-                    channel_id=channel,
-                    amount=amount,
-                    currency=currency,
-                    period=period,
-                    total_subscribers=subscribers,
-                    tier_breakdown={"Gold": gold_cnt, "Silver": silver_cnt}
-                )
-                
-            elif p_type == "sponsor":
-                amount = random.uniform(5000, 100000)
-                contract = f"CNT-{random.randint(1000,9999)}"
-                
-                payment = SponsorshipPayment(
-                    channel_id=channel,
-                    amount=amount,
-                    currency=currency,
-                    period=period,
-                    sponsor_name=f"Sponsor_{random.randint(1,20)}",
-                    contract_id=contract
-                )
-            result = service.create_payment_record(payment)
-            
-            if result.success:
-                success_cnt += 1
-                if random.random() > 0.7:
-                    service.simulate_payment_processing(payment.payment_id)
-            else:
-                fail_cnt += 1
+        return SponsorshipPayment(
+            channel_id=channel,
+            amount=amount,
+            currency=currency,
+            period=period,
+            sponsor_name=f"Sponsor_{random.randint(1,20)}",
+            contract_id=contract
+        )
+
+    # 0: reklam, 1: üyelik, 2: sponsorluk
+    builders = (build_ad, build_member, build_sponsor)
+    type_codes = random.choices((0, 1, 2), k=count)
 
+    fail_cnt = 0
+    payments = []
+
+    for i in range(count):
+        try:
+            payments.append(builders[type_codes[i]](i, channel_list[i], period_list[i], currency_list[i]))
         except Exception as e:
             fail_cnt += 1
             print(f"Beklenmeyen hata: {e}")
 
+    # Kayıtlar tek seferde repository'ye aktarılır
+    accepted = service.create_payment_records_bulk(payments)
+    success_cnt = 0
+    to_simulate = []
+    for payment, ok in zip(payments, accepted):
+        if ok:
+            success_cnt += 1
+            if random.random() > 0.7:
+                to_simulate.append(payment.payment_id)
+        else:
+            fail_cnt += 1
+    service.simulate_payment_processing_bulk(to_simulate)
+
+    service.repo.flush_console()
     print(f"Veri Üretimi Tamamlandı. Başarılı: {success_cnt}, Hatalı: {fail_cnt}")
 
 def demo_scenario():
@@ -106,6 +120,7 @@ def demo_scenario():
     sponsor_pay = SponsorshipPayment("KodlayanAdam", 50000.0, "TRY", "2025-04", "TechCorp", "CNT-99")
     res2 = revenue_service.create_payment_record(sponsor_pay)
     print(f"Sponsor Ödemesi Kayıt: {res2.message}")
+    repo.flush_console()
 
     print("Polimorfizm Gösterimi")
     payments_to_calc = [ad_pay, sponsor_pay]
@@ -116,12 +131,16 @@ def demo_scenario():
     
     low_pay = SponsorshipPayment("YeniKanal", 50.0, "TRY", "2025-04", "MiniMarket", "CNT-01")
     revenue_service.create_payment_record(low_pay)
+    repo.flush_console()
     print(f"Düşük Bakiye Ödemesi Eklendi. Durum: {low_pay.status}")
     
     print(" 'hold_low_payments' servisi çalıştırılıyor")
     held_count = revenue_service.hold_low_payments(threshold=100.0)
     print(f"İşlem Sonucu: {held_count} adet ödeme askıya alındı.")
     print(f"İşlem Sonrası Durum: {low_pay.status}")
+
+    riskli = AdRevenuePayment.toplu_sahtecilik_kontrolu(repo.filter_by_type(AdRevenuePayment))
+    print(f"Toplu sahtecilik kontrolü: {len(riskli)} reklam ödemesi askıya alındı.")
     
     print("Ödeme Simülasyonu ")
     sim_res = revenue_service.simulate_payment_processing(sponsor_pay.payment_id)
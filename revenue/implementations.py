@@ -1,11 +1,19 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional, Union
+from typing import Dict, List, Optional
 import random
+import sys
 import uuid
 from .base import PaymentBase
 
-@dataclass
+# dataclass(slots=True) Python 3.10 ile geldi; eski sürümlerde __dict__ ile devam edilir
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_VALID_AD_PLATFORMS = frozenset({
+    "Google AdSense", "Facebook Ads", "Unity Ads", "TikTok Business", "YouTube Partner"
+})
+
+@dataclass(**_DATACLASS_SLOTS)
 class VergiBilgisi:
     matrah: float
     vergi_orani: float
@@ -14,7 +22,7 @@ class VergiBilgisi:
     para_birimi: str
     hesaplama_tarihi: datetime = field(default_factory=datetime.now)
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ReklamPerformansMetriki:
     toplam_gosterim: int
     gecerli_gosterim: int
@@ -22,7 +30,7 @@ class ReklamPerformansMetriki:
     ortalama_cpm: float
     platform: str
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PaymentProcessResult:
     success: bool
     transaction_id: str
@@ -30,6 +38,19 @@ class PaymentProcessResult:
     processed_at: datetime = field(default_factory=datetime.now)
 
 class AdRevenuePayment(PaymentBase):
+    __slots__ = (
+        "_ad_impressions", "_cpm_rate", "ad_platform",
+        "_vergi_orani", "_gecersiz_trafik_orani", "_bonus_esigi",
+        "_performans_bonusu", "_metrik_onbellek", "_cached_net"
+    )
+
+    TYPE_CODE = 0
+    _RISK_ESIGI = 0.98
+    _TIKLAMA_ORANI = 0.015
+    # Risk skoru kaynağı; toplu denetimlerde tohumlu bir üreteçle değiştirilebilir.
+    # Örnek üzerinden değil sınıf üzerinden okunur, böylece atanan düz fonksiyonlar self almaz.
+    _risk_random = random.random
+
     def __init__(
         self, 
         channel_id: str, 
@@ -41,20 +62,46 @@ class AdRevenuePayment(PaymentBase):
         ad_platform: str = "Google AdSense"
     ):
         super().__init__(channel_id, amount, currency, period) 
-        self.ad_impressions =ad_impressions
-        self.cpm_rate = cpm_rate
+        self._ad_impressions = ad_impressions
+        self._cpm_rate = cpm_rate
         self.ad_platform = ad_platform
         self._vergi_orani = 0.18 
         self._gecersiz_trafik_orani = 0.02 
         self._bonus_esigi = 1000000
         self._performans_bonusu = 0.05
+        self._cached_net: Optional[float] = None
         self._metrik_onbellek = self._metrikleri_olustur()
 
+    @property
+    def ad_impressions(self) -> int:
+        return self._ad_impressions
+
+    @ad_impressions.setter
+    def ad_impressions(self, value: int):
+        self._ad_impressions = value
+        self._kazanc_onbellegini_temizle()
+
+    @property
+    def cpm_rate(self) -> float:
+        return self._cpm_rate
+
+    @cpm_rate.setter
+    def cpm_rate(self, value: float):
+        self._cpm_rate = value
+        self._kazanc_onbellegini_temizle()
+
+    def _kazanc_onbellegini_temizle(self):
+        # Net kazanç ve vergi gösterim/CPM'e bağlıdır; metrikler de yerinde yenilenir
+        self._cached_net = None
+        self._cached_tax = None
+        self._metrikleri_guncelle()
+
     def _gosterim_dogrula(self, deger: int) -> int:
-        if not isinstance(deger, int):
+        # Yaygın durum olan int için try/except kurulmaz
+        if type(deger) is not int:
             try:
                 deger = int(deger)
-            except:
+            except (TypeError, ValueError, OverflowError):
                 raise TypeError("Gösterim sayısı tam sayı olmalıdır.")
         if deger < 0:
             raise ValueError("Gösterim sayısı negatif olamaz.")
@@ -68,38 +115,45 @@ class AdRevenuePayment(PaymentBase):
         return float(deger)
 
     def _platform_kontrol(self, isim: str) -> str:
-        gecerli_platformlar = ["Google AdSense", "Facebook Ads", "Unity Ads", "TikTok Business", "YouTube Partner"]
-        if isim not in gecerli_platformlar:
+        if isim not in _VALID_AD_PLATFORMS:
             self.add_log(f"Bilinmeyen platform '{isim}'. Varsayılan olarak AdSense atandı.")
             return "Google AdSense"
         return isim
 
     def _metrikleri_olustur(self) -> ReklamPerformansMetriki:
-        tiklama_orani = 0.015 
         return ReklamPerformansMetriki(
             toplam_gosterim=self.ad_impressions,
             gecerli_gosterim=int(self.ad_impressions * (1 - self._gecersiz_trafik_orani)),
-            tahmini_tiklama=int(self.ad_impressions * tiklama_orani),
+            tahmini_tiklama=int(self.ad_impressions * self._TIKLAMA_ORANI),
             ortalama_cpm=self.cpm_rate,
             platform=self.ad_platform
         )
 
+    def _metrikleri_guncelle(self):
+        m = self._metrik_onbellek
+        m.toplam_gosterim = self.ad_impressions
+        m.gecerli_gosterim = int(self.ad_impressions * (1 - self._gecersiz_trafik_orani))
+        m.tahmini_tiklama = int(self.ad_impressions * self._TIKLAMA_ORANI)
+        m.ortalama_cpm = self.cpm_rate
+
     def calculate_tax(self) -> float:
-        duzeltilmis_gelir = self.net_kazanc_hesapla()
-        vergi = duzeltilmis_gelir * self._vergi_orani
-        self.add_log(f"Vergi matrahı: {duzeltilmis_gelir}, Hesaplanan vergi: {vergi}")
-        return round(vergi, 2)
+        if self._cached_tax is None:
+            vergi = self.net_kazanc_hesapla() * self._vergi_orani
+            self._cached_tax = round(vergi, 2)
+        return self._cached_tax
 
     def net_kazanc_hesapla(self) -> float:
-        ham_kazanc = (self.ad_impressions / 1000) * self.cpm_rate
-        kesinti = ham_kazanc * self._gecersiz_trafik_orani
-        bonus = 0.0
-        
-        if self.ad_impressions > self._bonus_esigi:
-            bonus = ham_kazanc * self._performans_bonusu
+        if self._cached_net is None:
+            ham_kazanc = (self.ad_impressions / 1000) * self.cpm_rate
+            kesinti = ham_kazanc * self._gecersiz_trafik_orani
+            bonus = 0.0
             
-        sonuc = ham_kazanc - kesinti + bonus
-        return round(sonuc, 2)
+            if self.ad_impressions > self._bonus_esigi:
+                bonus = ham_kazanc * self._performans_bonusu
+                
+            sonuc = ham_kazanc - kesinti + bonus
+            self._cached_net = round(sonuc, 2)
+        return self._cached_net
 
     def get_payment_details(self) -> dict:
         kazanc = self.net_kazanc_hesapla()
@@ -130,21 +184,38 @@ class AdRevenuePayment(PaymentBase):
     def update_impressions(self, new_count: int):
         eski_deger = self.ad_impressions
         self.ad_impressions = self._gosterim_dogrula(new_count)
-        yeni_tutar = self.net_kazanc_hesapla()
-        self.amount = yeni_tutar
-        self._metrik_onbellek = self._metrikleri_olustur()
+        self.amount = self.net_kazanc_hesapla()
         self.add_log(f"Gösterim güncellendi: {eski_deger} -> {new_count}. Yeni hakediş: {self.amount}")
 
     def sahtecilik_kontrolu_yap(self) -> bool:
-        risk_skoru = random.random()
-        if risk_skoru > 0.98:
-            self.status = "on_hold"
-            self.add_log("Yüksek riskli trafik tespit edildi. Ödeme askıya alındı.")
+        if type(self)._risk_random() > self._RISK_ESIGI:
+            self._riskli_olarak_isaretle()
             return False
         return True
 
+    def _riskli_olarak_isaretle(self):
+        self.status = "on_hold"
+        self.add_log("Yüksek riskli trafik tespit edildi. Ödeme askıya alındı.")
+
+    @classmethod
+    def toplu_sahtecilik_kontrolu(cls, payments: List["AdRevenuePayment"]) -> List["AdRevenuePayment"]:
+        rastgele = cls._risk_random
+        esik = cls._RISK_ESIGI
+        riskli = [p for p in payments if rastgele() > esik]
+        for p in riskli:
+            p._riskli_olarak_isaretle()
+        return riskli
+
 
 class MembershipRevenuePayment(PaymentBase):
+    __slots__ = (
+        "total_subscribers", "tier_breakdown",
+        "_platform_fee_rate", "_iade_rezerv_orani", "_stopaj_orani",
+        "_efektif_vergi_orani", "_cached_platform_share", "_cached_arpu"
+    )
+
+    TYPE_CODE = 1
+
     def __init__(
         self, 
         channel_id: str, 
@@ -161,6 +232,12 @@ class MembershipRevenuePayment(PaymentBase):
         self._platform_fee_rate = 0.30 
         self._iade_rezerv_orani = 0.05 
         self._stopaj_orani = 0.20 
+        # Platform payı, iade rezervi ve stopaj tek bir orana indirgenir
+        self._efektif_vergi_orani = (
+            (1 - self._platform_fee_rate) * (1 - self._iade_rezerv_orani) * self._stopaj_orani
+        )
+        self._cached_platform_share: Optional[float] = None
+        self._cached_arpu: Optional[float] = None
 
     def _abone_sayisi_dogrula(self, sayi: int) -> int:
         if sayi < 0:
@@ -178,29 +255,37 @@ class MembershipRevenuePayment(PaymentBase):
         return dagilim
 
     def calculate_tax(self) -> float:
-        net_after_fee = self.amount * (1 - self._platform_fee_rate)
-        vergi_matrahi = net_after_fee * (1 - self._iade_rezerv_orani)
-        vergi = vergi_matrahi * self._stopaj_orani
-        
-        self.add_log(f"Platform (%30) ve Stopaj (%20) hesaplandı: {vergi}")
-        return round(vergi, 2)
+        if self._cached_tax is None:
+            self._cached_tax = round(self.amount * self._efektif_vergi_orani, 2)
+        return self._cached_tax
+
+    def _invalidate_cache(self):
+        super()._invalidate_cache()
+        self._cached_platform_share = None
+        self._cached_arpu = None
 
     def calculate_platform_share(self) -> float:
-        return round(self.amount * self._platform_fee_rate, 2)
+        if self._cached_platform_share is None:
+            self._cached_platform_share = round(self.amount * self._platform_fee_rate, 2)
+        return self._cached_platform_share
 
     def arpu_hesapla(self) -> float:
-        if self.total_subscribers <= 0:
-            return 0.0
-        return round(self.amount / self.total_subscribers, 2)
+        if self._cached_arpu is None:
+            if self.total_subscribers <= 0:
+                self._cached_arpu = 0.0
+            else:
+                self._cached_arpu = round(self.amount / self.total_subscribers, 2)
+        return self._cached_arpu
 
     def get_payment_details(self) -> dict:
+        brut = self._amount
         return {
             "type": "MembershipRevenue",
             "id": self.payment_id,
             "revenue_breakdown": {
-                "gross_amount": self.amount,
-                "platform_fee": self.calculate_platform_share(),
-                "refund_reserve": self.amount * self._iade_rezerv_orani,
+                "gross_amount": brut,
+                "platform_fee": round(brut * self._platform_fee_rate, 2),
+                "refund_reserve": brut * self._iade_rezerv_orani,
                 "tax": self.calculate_tax()
             },
             "subscriber_stats": {
@@ -213,14 +298,23 @@ class MembershipRevenuePayment(PaymentBase):
         }
     
     def gelecek_ay_tahmini_yap(self, churn_rate: float = 0.05) -> float:
-        kalan_aboneler = self.total_subscribers * (1 - churn_rate)
-        mevcut_arpu = self.arpu_hesapla()
-        tahmin = kalan_aboneler * mevcut_arpu
+        # kalan abone * ARPU, tutar * (1 - churn) ifadesine sadeleşir
+        tahmin = self.amount * (1 - churn_rate) if self.total_subscribers > 0 else 0.0
         self.add_log(f"Gelecek ay tahmini yapıldı (Churn: %{churn_rate*100}): {tahmin}")
         return round(tahmin, 2)
 
 
 class SponsorshipPayment(PaymentBase):
+    __slots__ = (
+        "sponsor_name", "contract_id",
+        "is_invoice_sent", "taksit_sayisi", "teslimat_onaylandi"
+    )
+
+    TYPE_CODE = 2
+
+    # Kurumlar vergisi (%20) + damga vergisi (%0.948)
+    _TAX_RATE = 0.20 + 0.00948
+
     def __init__( 
         self, 
         channel_id: str, 
@@ -252,10 +346,9 @@ class SponsorshipPayment(PaymentBase):
         return c_id
 
     def calculate_tax(self) -> float:
-        kurumlar_vergisi = 0.20
-        damga_vergisi = 0.00948 
-        toplam_oran = kurumlar_vergisi + damga_vergisi
-        return round(self.amount * toplam_oran, 2)
+        if self._cached_tax is None:
+            self._cached_tax = round(self.amount * self._TAX_RATE, 2)
+        return self._cached_tax
 
     def get_payment_details(self) -> dict:
         return {
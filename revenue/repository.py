@@ -1,8 +1,19 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Set, Deque
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
+from bisect import insort, bisect_left, bisect_right
+from operator import itemgetter
+import heapq
+import math
+import sys
+import time
 from .base import PaymentBase
 
+_AMOUNT = itemgetter(1)
+
+_VALID_CURRENCIES = frozenset({"TRY", "USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CNY"})
+
 class PaymentRepositoryInterface:
     def save(self, payment: PaymentBase) -> PaymentBase: raise NotImplementedError
     def find_by_id(self, payment_id: str) -> Optional[PaymentBase]: raise NotImplementedError
@@ -11,13 +22,24 @@ class PaymentRepositoryInterface:
 class InMemoryPaymentRepository(PaymentRepositoryInterface):
     _VERSION = "2.5.0"
     _MAX_CAPACITY = 10000
+    _AUDIT_LOG_CAPACITY = 10000
+    _CONSOLE_FLUSH_THRESHOLD = 100
 
     def __init__(self): 
         self._storage: Dict[str, PaymentBase] = {}
-        self._channel_index: Dict[str, List[str]] = defaultdict(list)
-        self._status_index: Dict[str, List[str]] = defaultdict(list)
-        self._period_index: Dict[str, List[str]] = defaultdict(list)
-        self._audit_log: List[str] = []
+        self._channel_index: Dict[str, Set[str]] = defaultdict(set)
+        self._status_index: Dict[str, Set[str]] = defaultdict(set)
+        self._period_index: Dict[str, Set[str]] = defaultdict(set)
+        self._channel_period_index: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        # ödeme id -> güncel tutar; amount setter'ı payment_amount_changed ile senkron tutar
+        self._amounts: Dict[str, float] = {}
+        # (oluşturulma zamanı, ödeme id) çiftleri; tarih aralığı sorguları için sıralı
+        self._timeline: List[Tuple[datetime, str]] = []
+        self._indexed_status: Dict[str, str] = {}
+        # (zaman damgası, işlem türü, mesaj); metin biçimi okunurken üretilir
+        self._audit_log: Deque[Tuple[float, str, str]] = deque(maxlen=self._AUDIT_LOG_CAPACITY)
+        self._pending_console: List[str] = []
+        self._audit_reads = False
 
     def save(self, payment: PaymentBase) -> PaymentBase:
         if not isinstance(payment, PaymentBase):
@@ -27,66 +49,173 @@ class InMemoryPaymentRepository(PaymentRepositoryInterface):
             self._log_operation("ERROR", "Veritabanı kapasitesi dolu.")
             raise MemoryError("InMemory veritabanı limiti aşıldı.")
 
-        is_update = payment.payment_id in self._storage
-        self._storage[payment.payment_id] = payment
-        self._update_indices(payment)
+        row = self._snapshot(payment)
+        is_update = row[0] in self._storage
+        self._store_row(payment, row)
+        if not is_update:
+            insort(self._timeline, (row[5], row[0]))
             
         operation_type = "UPDATE" if is_update else "INSERT"
         log_msg = f"Kayıt başarılı: {payment.payment_id} [{operation_type}]"
-        print(f"[DB LOG] {log_msg}")
+        self._queue_console(f"[DB LOG] {log_msg}")
         self._log_operation("INFO", log_msg)
         return payment
 
-    def _update_indices(self, payment: PaymentBase):
-        if payment.payment_id not in self._channel_index[payment.channel_id]:
-            self._channel_index[payment.channel_id].append(payment.payment_id)
-        
-        if payment.payment_id not in self._status_index[payment.status]:
-            self._status_index[payment.status].append(payment.payment_id)
-            
-        if payment.payment_id not in self._period_index[payment.period]:
-            self._period_index[payment.period].append(payment.payment_id)
+    def save_bulk(self, payments: List[PaymentBase]) -> List[bool]:
+        for payment in payments:
+            if not isinstance(payment, PaymentBase):
+                raise TypeError("Sadece PaymentBase türevi nesneler kaydedilebilir.")
+
+        # Nesne özellikleri hiçbir yapı değişmeden okunur; burada oluşan hata
+        # repository'yi kısmen güncellenmiş bırakmaz
+        rows = [self._snapshot(p) for p in payments]
+
+        # Kapasite, tek tek save çağrılarıyla aynı sırada ve aynı kuralla uygulanır
+        storage = self._storage
+        size = len(storage)
+        batch_new = set()
+        stored = []
+        for row in rows:
+            if size >= self._MAX_CAPACITY:
+                stored.append(False)
+                continue
+            stored.append(True)
+            if row[0] not in storage and row[0] not in batch_new:
+                batch_new.add(row[0])
+                size += 1
+
+        new_entries = []
+        for payment, row, ok in zip(payments, rows, stored):
+            if ok:
+                if row[0] not in storage:
+                    new_entries.append((row[5], row[0]))
+                self._store_row(payment, row)
+        if new_entries:
+            # Zaman çizelgesi satır başı insort yerine tek sıralamayla birleştirilir
+            self._timeline.extend(new_entries)
+            self._timeline.sort()
+
+        rejected = len(stored) - sum(stored)
+        if rejected:
+            self._log_operation("ERROR", f"Veritabanı kapasitesi dolu. {rejected} kayıt reddedildi.")
+        log_msg = (
+            f"Toplu kayıt başarılı: {len(new_entries)} INSERT, "
+            f"{len(payments) - rejected - len(new_entries)} UPDATE"
+        )
+        self._queue_console(f"[DB LOG] {log_msg}")
+        self._log_operation("INFO", log_msg)
+        return stored
+
+    @staticmethod
+    def _snapshot(payment: PaymentBase) -> Tuple[str, str, str, str, float, datetime]:
+        return (
+            payment.payment_id, payment.channel_id, payment.period,
+            payment.status, payment.amount, payment._created_at
+        )
+
+    def _store_row(self, payment: PaymentBase, row: Tuple[str, str, str, str, float, datetime]):
+        # Yalnızca önceden okunmuş değerlerle sözlük/küme işlemleri yapılır
+        pid, channel_id, period, status, amount, _ = row
+        self._storage[pid] = payment
+        payment.add_observer(self)
+        self._channel_index[channel_id].add(pid)
+        self._set_indexed_status(pid, status)
+        self._period_index[period].add(pid)
+        self._channel_period_index[(channel_id, period)].add(pid)
+        self._amounts[pid] = amount
+
+    def payment_status_changed(self, payment: PaymentBase):
+        self._set_indexed_status(payment.payment_id, payment.status)
+
+    def _set_indexed_status(self, payment_id: str, status: str):
+        previous_status = self._indexed_status.get(payment_id)
+        if previous_status is not None and previous_status != status:
+            self._remove_from_index(self._status_index, previous_status, payment_id)
+        self._status_index[status].add(payment_id)
+        self._indexed_status[payment_id] = status
+
+    def update_status(self, payment_id: str, new_status: str) -> Optional[PaymentBase]:
+        payment = self._storage.get(payment_id)
+        if payment is None:
+            return None
+        # Statü setter'ı indeksi payment_status_changed ile günceller
+        payment.status = new_status
+        return payment
+
+    def update_status_bulk(self, payment_ids: List[str], new_status: str) -> List[PaymentBase]:
+        updated = []
+        for pid in payment_ids:
+            payment = self._storage.get(pid)
+            if payment is not None:
+                payment.status = new_status
+                updated.append(payment)
+        # Toplu işlem satır başına değil tek bir denetim kaydıyla izlenir
+        self._log_operation("STATUS", f"{len(updated)} kayıt durumu güncellendi: {new_status}")
+        return updated
+
+    def payment_amount_changed(self, payment: PaymentBase):
+        self._amounts[payment.payment_id] = payment.amount
+
+    def _remove_from_aggregates(self, payment: PaymentBase):
+        self._amounts.pop(payment.payment_id, None)
 
     def find_by_id(self, payment_id: str) -> Optional[PaymentBase]:
         found = self._storage.get(payment_id)
-        if found:
+        if self._audit_reads and found:
             self._log_operation("READ", f"Erişildi: {payment_id}")
         return found
 
     def find_all_by_channel(self, channel_id: str) -> List[PaymentBase]:
-        payment_ids = self._channel_index.get(channel_id, [])
-        results = []
-        for pid in payment_ids:
-            if pid in self._storage:
-                results.append(self._storage[pid])
-        return results
+        payment_ids = self._channel_index.get(channel_id, ())
+        return [self._storage[pid] for pid in payment_ids]
 
     def find_by_status(self, status: str) -> List[PaymentBase]:
-        payment_ids = self._status_index.get(status, [])
-        return [self._storage[pid] for pid in payment_ids if pid in self._storage]
+        payment_ids = self._status_index.get(status, ())
+        return [self._storage[pid] for pid in payment_ids]
+
+    def find_by_channel_and_status(self, channel_id: str, status: str) -> List[PaymentBase]:
+        channel_ids = self._channel_index.get(channel_id)
+        status_ids = self._status_index.get(status)
+        if not channel_ids or not status_ids:
+            return []
+        # Kesişim küçük küme üzerinden dolaşılarak hesaplanır
+        return [self._storage[pid] for pid in channel_ids & status_ids]
+
+    def find_ids_by_status_and_amount(
+        self, status: str, min_amount: float, max_amount: float
+    ) -> List[str]:
+        # Kova yalnızca adayları daraltır; statü ve tutar ödemenin güncel değerinden okunur
+        storage = self._storage
+        matched = []
+        for pid in self._status_index.get(status, ()):
+            payment = storage[pid]
+            if payment.status == status and min_amount <= payment.amount <= max_amount:
+                matched.append(pid)
+        return matched
 
     def find_by_period(self, period: str) -> List[PaymentBase]:
-        payment_ids = self._period_index.get(period, [])
-        return [self._storage[pid] for pid in payment_ids if pid in self._storage]
+        payment_ids = self._period_index.get(period, ())
+        return [self._storage[pid] for pid in payment_ids]
+
+    def find_by_channel_and_period(self, channel_id: str, period: str) -> List[PaymentBase]:
+        payment_ids = self._channel_period_index.get((channel_id, period), ())
+        return [self._storage[pid] for pid in payment_ids]
 
     def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[PaymentBase]:
-        results = []
-        for payment in self._storage.values():
-            if start_date <= payment._created_at <= end_date:
-                results.append(payment)
-        return results
+        lo = bisect_left(self._timeline, (start_date,))
+        hi = bisect_right(self._timeline, (end_date, "\uffff"))
+        return [self._storage[pid] for _, pid in self._timeline[lo:hi]]
 
     def find_by_amount_range(self, min_amount: float, max_amount: float) -> List[PaymentBase]:
-        results = []
-        for payment in self._storage.values():
-            if min_amount <= payment.amount <= max_amount:
-                results.append(payment)
-        return results
+        # Tutar sütunu (_amounts) üzerinden taranır; nesne özelliğine satır başı erişilmez
+        return [
+            self._storage[pid] for pid, amount in self._amounts.items()
+            if min_amount <= amount <= max_amount
+        ]
 
     def get_top_payments(self, limit: int = 5) -> List[PaymentBase]:
-        all_payments = list(self._storage.values())
-        sorted_payments = sorted(all_payments, key=lambda p: p.amount, reverse=True)
-        return sorted_payments[:limit]
+        top = heapq.nlargest(limit, self._amounts.items(), key=_AMOUNT)
+        return [self._storage[pid] for pid, _ in top]
 
     def filter_by_type(self, payment_type_class) -> List[PaymentBase]:
         return [
@@ -99,26 +228,39 @@ class InMemoryPaymentRepository(PaymentRepositoryInterface):
             payment = self._storage[payment_id]
             
             self._remove_from_index(self._channel_index, payment.channel_id, payment_id)
-            self._remove_from_index(self._status_index, payment.status, payment_id)
+            self._remove_from_index(
+                self._status_index, self._indexed_status.pop(payment_id, payment.status), payment_id
+            )
             self._remove_from_index(self._period_index, payment.period, payment_id)
+            self._remove_from_index(
+                self._channel_period_index, (payment.channel_id, payment.period), payment_id
+            )
+            self._remove_from_aggregates(payment)
+
+            entry = (payment._created_at, payment_id)
+            pos = bisect_left(self._timeline, entry)
+            if pos < len(self._timeline) and self._timeline[pos] == entry:
+                self._timeline.pop(pos)
             
             del self._storage[payment_id]
+            payment.remove_observer(self)
             self._log_operation("DELETE", f"Silindi: {payment_id}")
             return True
         return False
 
-    def _remove_from_index(self, index_dict: dict, key: str, payment_id: str):
-        if key in index_dict:
-            if payment_id in index_dict[key]:
-                index_dict[key].remove(payment_id)
-            if not index_dict[key]:
+    def _remove_from_index(self, index_dict: dict, key: Any, payment_id: str):
+        ids = index_dict.get(key)
+        if ids is not None:
+            ids.discard(payment_id)
+            if not ids:
                 del index_dict[key]
 
     def get_total_volume(self) -> float:
-        total = 0.0
-        for p in self._storage.values():
-            total += p.amount
-        return total
+        # Artımlı toplama/çıkarma yuvarlama hatası biriktirir; fsum tutar sütununu tam toplar
+        return math.fsum(self._amounts.values())
+
+    def get_payment_count(self) -> int:
+        return len(self._storage)
 
     def get_status_distribution(self) -> Dict[str, int]:
         stats = {}
@@ -127,11 +269,34 @@ class InMemoryPaymentRepository(PaymentRepositoryInterface):
         return stats
 
     def _log_operation(self, op_type: str, message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self._audit_log.append(f"[{timestamp}] [{op_type}] {message}")
+        self._audit_log.append((time.time(), op_type, message))
 
     def get_audit_logs(self, limit: int = 10) -> List[str]:
-        return self._audit_log[-limit:]
+        # Halka tampon sondan okunur; yalnızca istenen kayıtlar kopyalanıp biçimlenir
+        tail = list(islice(reversed(self._audit_log), max(limit, 0)))
+        tail.reverse()
+        return [
+            f"[{datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')}] [{op_type}] {message}"
+            for ts, op_type, message in tail
+        ]
+
+    def enable_read_audit(self):
+        self._audit_reads = True
+
+    def disable_read_audit(self):
+        self._audit_reads = False
+
+    def _queue_console(self, line: str):
+        # Tampon sınırsız büyümez; eşiğe ulaşınca kendiliğinden boşaltılır
+        self._pending_console.append(line)
+        if len(self._pending_console) >= self._CONSOLE_FLUSH_THRESHOLD:
+            self.flush_console()
+
+    def flush_console(self):
+        if self._pending_console:
+            self._pending_console.append("")
+            sys.stdout.write("\n".join(self._pending_console))
+            self._pending_console.clear()
 
     @classmethod
     def get_db_info(cls) -> Dict[str, Any]:
@@ -145,14 +310,10 @@ class InMemoryPaymentRepository(PaymentRepositoryInterface):
     
     @staticmethod
     def validate_currency_code(code: str) -> bool:
-        if not isinstance(code, str):
-            return False
-        
-        valid_codes = [
-            "TRY", "USD", "EUR", "GBP", 
-            "JPY", "CAD", "AUD", "CNY"
-        ]
-        return code.upper().strip() in valid_codes
+        # Ödeme nesneleri kodu zaten büyük harfe çevirir; normalizasyon yalnızca ıskalamada yapılır
+        if type(code) is str and code in _VALID_CURRENCIES:
+            return True
+        return isinstance(code, str) and code.upper().strip() in _VALID_CURRENCIES
 
     @staticmethod
     def format_money(amount: float, currency: str) -> str:
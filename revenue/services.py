@@ -1,26 +1,46 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import random
-from .base import PaymentBase
+import time
+from .base import PaymentBase, REVENUE_KINDS
 from .repository import InMemoryPaymentRepository
-from .implementations import PaymentProcessResult, AdRevenuePayment, MembershipRevenuePayment, SponsorshipPayment
+from .implementations import PaymentProcessResult
 
 class RevenueService:
 
     def __init__(self, repository: InMemoryPaymentRepository):
         self.repo = repository
+        # (dakika, biçimlenmiş zaman); rapor zaman damgası dakika değişince yeniden üretilir
+        self._ts_cache = (-1, "")
 
-    def create_payment_record(self, payment: PaymentBase) -> PaymentProcessResult:
-        try:
-            if not payment.is_payable():
-                return PaymentProcessResult(False, "", "Ödeme yapılabilir durumda değil (Tutar 0 veya statü hatalı).")
+    def _report_timestamp(self) -> str:
+        minute = int(time.time() // 60)
+        if minute != self._ts_cache[0]:
+            self._ts_cache = (minute, datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d %H:%M"))
+        return self._ts_cache[1]
 
-            if payment.amount <= 0:
-                return PaymentProcessResult(False, "", "Tutar sıfır veya negatif olamaz.")
-            
-            if not self.repo.validate_currency_code(payment.currency):
-                return PaymentProcessResult(False, "", f"Geçersiz para birimi: {payment.currency}")
+    def _validate_payment_record(self, payment: PaymentBase) -> Optional[str]:
+        # Yalnızca koşul kontrolleri; hata yoksa None döner
+        if not isinstance(payment, PaymentBase):
+            return "Sadece PaymentBase türevi nesneler kaydedilebilir."
+
+        if not payment.is_payable():
+            return "Ödeme yapılabilir durumda değil (Tutar 0 veya statü hatalı)."
+
+        if payment.amount <= 0:
+            return "Tutar sıfır veya negatif olamaz."
 
+        if not self.repo.validate_currency_code(payment.currency):
+            return f"Geçersiz para birimi: {payment.currency}"
+        return None
+
+    def create_payment_record(self, payment: PaymentBase) -> PaymentProcessResult:
+        error = self._validate_payment_record(payment)
+        if error is not None:
+            return PaymentProcessResult(False, "", error)
+
+        # Yalnızca istisna fırlatabilecek kayıt adımı try içinde tutulur
+        try:
             self.repo.save(payment)
             return PaymentProcessResult(
                 success=True, 
@@ -35,6 +55,17 @@ class RevenueService:
         except Exception as e:
             return PaymentProcessResult(False, "", f"Bilinmeyen Hata: {str(e)}")
 
+    def create_payment_records_bulk(self, payments: List[PaymentBase]) -> List[bool]:
+        validate = self._validate_payment_record
+        accepted = [validate(p) is None for p in payments]
+        try:
+            stored = iter(self.repo.save_bulk([p for p, ok in zip(payments, accepted) if ok]))
+        except Exception:
+            # save_bulk hata verdiğinde repository'de hiçbir değişiklik yapılmamıştır
+            return [False] * len(payments)
+        # Kapasite nedeniyle reddedilenler doğrulamadan geçmiş olsa da başarısız sayılır
+        return [ok and next(stored) for ok in accepted]
+
     def simulate_payment_processing(self, payment_id: str) -> PaymentProcessResult:
         payment = self.repo.find_by_id(payment_id)
         if not payment:
@@ -44,43 +75,70 @@ class RevenueService:
             return PaymentProcessResult(False, payment_id, "Ödeme zaten tamamlanmış.")
 
         if payment.amount > 50000 and payment.status != "processing":
-            payment.status = "processing"
+            self.repo.update_status(payment_id, "processing")
             payment.add_log("Yüksek tutar nedeniyle işlem manuel incelemeye alındı.")
             return PaymentProcessResult(True, payment_id, "İşlem manuel onay kuyruğuna alındı.")
 
         is_success = random.random() > 0.15  # %15 Hata payı
 
         if is_success:
-            payment.status = "completed"
+            self.repo.update_status(payment_id, "completed")
             payment.add_log("Banka onayı alındı. Transfer tamamlandı.")
             return PaymentProcessResult(True, payment_id, "Transfer başarılı.")
         else:
-            payment.status = "failed"
+            self.repo.update_status(payment_id, "failed")
             payment.add_log("Banka reddi: Yetersiz bakiye veya teknik hata.")
             return PaymentProcessResult(False, payment_id, "Transfer başarısız.")
 
+    def simulate_payment_processing_bulk(self, payment_ids: List[str]) -> List[PaymentProcessResult]:
+        results = []
+        # Hedef statüye göre gruplanır; her grup repository'de tek toplu güncelleme olur
+        to_processing, to_completed, to_failed = [], [], []
+        rastgele = random.random
+
+        for pid in payment_ids:
+            payment = self.repo.find_by_id(pid)
+            if not payment:
+                results.append(PaymentProcessResult(False, "", "Ödeme bulunamadı."))
+            elif payment.status == "completed":
+                results.append(PaymentProcessResult(False, pid, "Ödeme zaten tamamlanmış."))
+            elif payment.amount > 50000 and payment.status != "processing":
+                to_processing.append(pid)
+                results.append(PaymentProcessResult(True, pid, "İşlem manuel onay kuyruğuna alındı."))
+            elif rastgele() > 0.15:  # %15 Hata payı
+                to_completed.append(pid)
+                results.append(PaymentProcessResult(True, pid, "Transfer başarılı."))
+            else:
+                to_failed.append(pid)
+                results.append(PaymentProcessResult(False, pid, "Transfer başarısız."))
+
+        for ids, status, log_msg in (
+            (to_processing, "processing", "Yüksek tutar nedeniyle işlem manuel incelemeye alındı."),
+            (to_completed, "completed", "Banka onayı alındı. Transfer tamamlandı."),
+            (to_failed, "failed", "Banka reddi: Yetersiz bakiye veya teknik hata."),
+        ):
+            if ids:
+                for payment in self.repo.update_status_bulk(ids, status):
+                    payment.add_log(log_msg)
+        return results
+
     def generate_periodic_report(self, channel_id: str, period: str) -> Dict:
-        all_payments = self.repo.find_all_by_channel(channel_id)
-        
-        period_payments = [p for p in all_payments if p.period == period]
-        
-        total_gross = sum(p.amount for p in period_payments)
-        total_tax = sum(p.calculate_tax() for p in period_payments)
-        
-        breakdown = {"AdRevenue": 0.0, "Membership": 0.0, "Sponsorship": 0.0}
-        
+        period_payments = self.repo.find_by_channel_and_period(channel_id, period)
+
+        # Tutar ve vergi kovadaki ödemelerin güncel değerlerinden tek geçişte toplanır
+        volumes = [0.0] * len(REVENUE_KINDS)
+        total_tax = 0.0
         for p in period_payments:
-            if isinstance(p, AdRevenuePayment):
-                breakdown["AdRevenue"] += p.amount
-            elif isinstance(p, MembershipRevenuePayment):
-                breakdown["Membership"] += p.amount
-            elif isinstance(p, SponsorshipPayment):
-                breakdown["Sponsorship"] += p.amount
+            volumes[p.TYPE_CODE] += p.amount
+            total_tax += p.calculate_tax()
+        total_gross = sum(volumes)
+        # Tür kodu sırasıyla gelen tutarlar; tanımsız tür (son kova) dağılıma girmez
+        breakdown = dict(zip(REVENUE_KINDS[:3], volumes))
 
         return {
             "channel_id": channel_id,
             "period": period,
-            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "generated_at": self._report_timestamp(),
             "total_gross_income": round(total_gross, 2),
             "total_estimated_tax": round(total_tax, 2),
             "net_income_projection": round(total_gross - total_tax, 2),
@@ -89,61 +147,76 @@ class RevenueService:
         }
 
     def hold_low_payments(self, threshold: float = 100.0):
-        low_payments = self.repo.find_by_amount_range(0.01, threshold)
-        
-        count = 0
-        for payment in low_payments:
-            if payment.status == "pending":
-                payment.status = "on_hold"
-                payment.add_log(f"Minimum ödeme eşiği ({threshold}) altında olduğu için beklemeye alındı.")
-                count += 1
+        # Yalnızca bekleyen kova taranır, statüler tek seferde güncellenir
+        pending_ids = self.repo.find_ids_by_status_and_amount("pending", 0.01, threshold)
+        held = self.repo.update_status_bulk(pending_ids, "on_hold")
+        log_msg = f"Minimum ödeme eşiği ({threshold}) altında olduğu için beklemeye alındı."
+        for payment in held:
+            payment.add_log(log_msg)
+        count = len(held)
         
         print(f"[Service Log] {count} adet ödeme beklemeye alındı.")
         return count
 
     def filter_payments_by_status(self, channel_id: str, status: str) -> List[PaymentBase]:
-        channel_payments = self.repo.find_all_by_channel(channel_id)
-        return [p for p in channel_payments if p.status == status]
+        return self.repo.find_by_channel_and_status(channel_id, status)
     
     def calculate_total_tax_liability(self, payment_list: List[PaymentBase]) -> float:
-        total_tax = 0.0
-        for payment in payment_list:
-            total_tax += payment.calculate_tax()
-        return round(total_tax, 2)
+        # calculate_tax ödeme üzerinde önbelleğe alınır; güncel değer her zaman buradan okunur
+        return round(sum((payment.calculate_tax() for payment in payment_list), 0.0), 2)
     
     def bulk_status_update(self, payment_ids: List[str], new_status: str) -> int:
-        success_count = 0
-        for pid in payment_ids:
-            payment = self.repo.find_by_id(pid)
-            if payment:
-                try:
-                    payment.status = new_status
-                    success_count += 1
-                except ValueError:
-                    continue 
-        return success_count
+        # Statü tek sefer doğrulanır; geçersizse hiçbir kayıt güncellenemez
+        if not PaymentBase.is_valid_status(new_status):
+            return 0
+        return len(self.repo.update_status_bulk(payment_ids, new_status))
 
 class AnalyticsService: 
     
+    @staticmethod
+    def _growth(old_val: float, new_val: float) -> Tuple[Optional[float], int]:
+        # Trend kodları: 0 artış, 1 düşüş/sabit, 2 önceki dönem verisi yok
+        if old_val == 0:
+            return None, 2
+        growth = ((new_val - old_val) / old_val) * 100
+        return growth, 0 if growth > 0 else 1
+
     @staticmethod
     def compare_periods(report_old: Dict, report_new: Dict) -> str:
         old_val = report_old.get("total_gross_income", 0)
         new_val = report_new.get("total_gross_income", 0)
         
-        if old_val == 0:
+        growth, trend = AnalyticsService._growth(old_val, new_val)
+        if trend == 2:
             return "Önceki dönem verisi yok."
             
-        growth = ((new_val - old_val) / old_val) * 100
-        trend_icon = "(+)" if growth > 0 else "(-)"
+        trend_icon = "(+)" if trend == 0 else "(-)"
         return f"Büyüme Oranı: %{growth:.2f} {trend_icon}"
 
+    @staticmethod
+    def compare_periods_bulk(
+        old_vals: List[float], new_vals: List[float]
+    ) -> Tuple[List[Optional[float]], List[int]]:
+        if len(old_vals) != len(new_vals):
+            raise ValueError(
+                f"Dönem listelerinin uzunlukları eşleşmiyor: {len(old_vals)} != {len(new_vals)}"
+            )
+        growths: List[Optional[float]] = []
+        trends: List[int] = []
+        for old_val, new_val in zip(old_vals, new_vals):
+            growth, trend = AnalyticsService._growth(old_val, new_val)
+            growths.append(growth)
+            trends.append(trend)
+        return growths, trends
+
     def analyze_system_health(self, repository: InMemoryPaymentRepository) -> Dict[str, Any]:
         status_dist = repository.get_status_distribution()
         total_vol = repository.get_total_volume()
         audit_logs = repository.get_audit_logs(limit=5)
         
         failed = status_dist.get("failed", 0)
-        total_ops = sum(status_dist.values())
+        # Her kayıt tam olarak bir statü kovasındadır; toplam, kayıt sayısına eşittir
+        total_ops = repository.get_payment_count()
         failure_rate = (failed / total_ops * 100) if total_ops > 0 else 0
         
         return {
@@ -46,9 +46,9 @@ def generate_report_cli(revenue_service: RevenueService):
         print(f"Toplam İşlem Sayısı  : {report['transaction_count']}")
         currency = report.get('currency', 'TRY') 
         
-        print(f"BRÜT GELİR            : {report['total_gross_income']:.2f} {currency}")
-        print(f"TAHMİNİ VERGİ YÜKÜ    : {report['total_estimated_tax']:.2f} {currency}")
-        print(f"TAHMİNİ NET GELİR     : {report['net_income_projection']:.2f} {currency}")
+        print("BRÜT GELİR            : %.2f %s" % (report['total_gross_income'], currency))
+        print("TAHMİNİ VERGİ YÜKÜ    : %.2f %s" % (report['total_estimated_tax'], currency))
+        print("TAHMİNİ NET GELİR     : %.2f %s" % (report['net_income_projection'], currency))
         
         print("-" * 50)
         print("Gelir Dağılımı:")
@@ -56,7 +56,7 @@ def generate_report_cli(revenue_service: RevenueService):
         has_data = False
         for revenue_type, amount in report['breakdown'].items():
              if amount > 0:
-                print(f"  * {revenue_type}: {amount:.2f} {currency}")
+                print("  * %s: %.2f %s" % (revenue_type, amount, currency))
                 has_data = True
 
         if not has_data:
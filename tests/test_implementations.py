@@ -0,0 +1,86 @@
+import unittest
+from decimal import Decimal
+
+from revenue.implementations import AdRevenuePayment
+
+
+def _ad(impressions=100000, cpm=15.0):
+    return AdRevenuePayment("KanalY", 1500.0, "TRY", "2025-01", impressions, cpm, "Google AdSense")
+
+
+class AdRevenueCacheTests(unittest.TestCase):
+
+    def test_cpm_assignment_refreshes_cached_tax(self):
+        payment = _ad()
+        self.assertEqual(payment.calculate_tax(), 264.6)
+
+        payment.cpm_rate = 30.0
+
+        self.assertEqual(payment.net_kazanc_hesapla(), 2940.0)
+        self.assertEqual(payment.calculate_tax(), 529.2)
+        self.assertEqual(payment.get_payment_details()["ad_metrics"]["cpm"], 30.0)
+
+    def test_impression_assignment_refreshes_cache_and_metrics(self):
+        payment = _ad()
+        payment.calculate_tax()
+
+        payment.ad_impressions = 1000
+
+        self.assertEqual(payment.calculate_tax(), 2.65)
+        details = payment.get_payment_details()
+        self.assertEqual(details["ad_metrics"]["valid_impressions"], 980)
+        self.assertEqual(details["financial_data"]["adjusted_earnings"], 14.7)
+
+
+class FraudCheckTests(unittest.TestCase):
+
+    def setUp(self):
+        self._original = AdRevenuePayment.__dict__["_risk_random"]
+
+    def tearDown(self):
+        AdRevenuePayment._risk_random = self._original
+
+    def test_single_check_accepts_plain_function_generator(self):
+        payment = _ad()
+        AdRevenuePayment._risk_random = lambda: 0.99
+
+        self.assertFalse(payment.sahtecilik_kontrolu_yap())
+        self.assertEqual(payment.status, "on_hold")
+
+    def test_single_check_passes_below_threshold(self):
+        payment = _ad()
+        AdRevenuePayment._risk_random = lambda: 0.5
+
+        self.assertTrue(payment.sahtecilik_kontrolu_yap())
+        self.assertEqual(payment.status, "pending")
+
+    def test_bulk_check_marks_only_risky_payments(self):
+        payments = [_ad(), _ad(), _ad()]
+        scores = iter([0.99, 0.1, 0.985])
+        AdRevenuePayment._risk_random = lambda: next(scores)
+
+        risky = AdRevenuePayment.toplu_sahtecilik_kontrolu(payments)
+
+        self.assertEqual(risky, [payments[0], payments[2]])
+        self.assertEqual([p.status for p in payments], ["on_hold", "pending", "on_hold"])
+
+
+class AmountValidationTests(unittest.TestCase):
+
+    def test_non_numeric_amount_raises_custom_type_error(self):
+        payment = _ad()
+        for value in (Decimal("7.5"), "5"):
+            with self.assertRaisesRegex(TypeError, "Tutar sayısal bir değer olmalıdır."):
+                payment.amount = value
+        self.assertEqual(payment.amount, 1500.0)
+
+    def test_int_subclasses_are_accepted(self):
+        payment = _ad()
+        payment.amount = True
+        self.assertEqual(payment.amount, 1.0)
+        payment.amount = 250
+        self.assertEqual(payment.amount, 250.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+import contextlib
+import copy
+import io
+import pickle
+import unittest
+
+from revenue.implementations import AdRevenuePayment, SponsorshipPayment
+from revenue.repository import InMemoryPaymentRepository
+from revenue.services import RevenueService
+
+
+def _sponsor(channel="KanalX", amount=50.0, period="2025-01"):
+    return SponsorshipPayment(channel, amount, "TRY", period, "Sponsor", "CNT-1")
+
+
+def _ad(channel="KanalY", amount=1500.0, period="2025-01"):
+    return AdRevenuePayment(channel, amount, "TRY", period, 100000, 15.0, "Google AdSense")
+
+
+class StatusIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+
+    def test_status_setter_reindexes_saved_payment(self):
+        payment = _sponsor()
+        self.repo.save(payment)
+        payment.status = "completed"
+
+        self.assertEqual(self.repo.find_by_status("completed"), [payment])
+        self.assertEqual(self.repo.find_by_status("pending"), [])
+        self.assertEqual(self.service.filter_payments_by_status("KanalX", "completed"), [payment])
+
+    def test_fraud_check_moves_payment_to_on_hold_bucket(self):
+        payment = _ad()
+        self.repo.save(payment)
+        payment._riskli_olarak_isaretle()
+
+        self.assertEqual(self.repo.get_status_distribution(), {"on_hold": 1})
+
+    def test_deleted_payment_no_longer_updates_index(self):
+        payment = _sponsor()
+        self.repo.save(payment)
+        self.repo.delete(payment.payment_id)
+        payment.status = "completed"
+
+        self.assertEqual(self.repo.get_status_distribution(), {})
+
+
+class AmountColumnTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+
+    def test_amount_queries_follow_changes_after_save(self):
+        ad = _ad()
+        sponsor = _sponsor(amount=500.0)
+        self.repo.save(ad)
+        self.repo.save(sponsor)
+        ad.update_impressions(1000)
+
+        self.assertEqual(self.repo.find_by_amount_range(0, 100), [ad])
+        self.assertEqual(self.repo.get_top_payments(1), [sponsor])
+
+    def test_direct_amount_assignment_updates_total_volume(self):
+        payment = _sponsor(amount=500.0)
+        self.repo.save(payment)
+        payment.amount = 200.0
+
+        self.assertEqual(self.repo.get_total_volume(), 200.0)
+
+    def test_total_volume_does_not_drift_across_updates(self):
+        payments = [_sponsor(amount=0.1) for _ in range(10)]
+        for payment in payments:
+            self.repo.save(payment)
+        for payment in payments:
+            payment.amount = 0.7
+            payment.amount = 0.1
+
+        self.assertEqual(self.repo.get_total_volume(), 1.0)
+
+    def test_deleted_payment_no_longer_updates_amounts(self):
+        payment = _sponsor(amount=500.0)
+        self.repo.save(payment)
+        self.repo.delete(payment.payment_id)
+        payment.amount = 200.0
+
+        self.assertEqual(self.repo.get_total_volume(), 0.0)
+        self.assertEqual(self.repo.find_by_amount_range(0, 1000), [])
+
+
+class SharedPaymentTests(unittest.TestCase):
+
+    def setUp(self):
+        self.first = InMemoryPaymentRepository()
+        self.second = InMemoryPaymentRepository()
+        self.payment = _sponsor(amount=50.0)
+        self.first.save(self.payment)
+        self.second.save(self.payment)
+
+    def test_amount_change_reaches_every_owning_repository(self):
+        self.payment.amount = 10.0
+
+        for repo in (self.first, self.second):
+            self.assertEqual(repo.get_total_volume(), 10.0)
+            self.assertEqual(repo.find_by_amount_range(0, 20), [self.payment])
+            self.assertEqual(repo.get_top_payments(1), [self.payment])
+
+    def test_status_change_reaches_every_owning_repository(self):
+        self.payment.status = "completed"
+
+        for repo in (self.first, self.second):
+            service = RevenueService(repo)
+            self.assertEqual(repo.find_by_status("completed"), [self.payment])
+            self.assertEqual(repo.find_by_status("pending"), [])
+            self.assertEqual(service.filter_payments_by_status("KanalX", "completed"), [self.payment])
+
+    def test_delete_unregisters_only_that_repository(self):
+        self.first.delete(self.payment.payment_id)
+        self.payment.amount = 10.0
+
+        self.assertEqual(self.first.get_total_volume(), 0.0)
+        self.assertEqual(self.second.get_total_volume(), 10.0)
+
+    def test_copies_do_not_carry_repositories(self):
+        for clone in (copy.deepcopy(self.payment), pickle.loads(pickle.dumps(self.payment))):
+            self.assertEqual(clone._observers, [])
+            self.assertEqual(clone.payment_id, self.payment.payment_id)
+            self.assertEqual(clone.amount, 50.0)
+            clone.amount = 99.0
+            self.assertEqual(self.first.get_total_volume(), 50.0)
+
+
+class _BrokenPeriodPayment(SponsorshipPayment):
+    __slots__ = ()
+
+    @property
+    def period(self):
+        raise RuntimeError("dönem okunamadı")
+
+
+class SaveBulkTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+
+    def test_bulk_save_indexes_like_single_save(self):
+        first, second = _sponsor(amount=100.0), _ad(amount=200.0)
+
+        stored = self.repo.save_bulk([first, second, first])
+
+        self.assertEqual(stored, [True, True, True])
+        self.assertEqual(self.repo.get_payment_count(), 2)
+        self.assertEqual(self.repo.get_total_volume(), 300.0)
+        self.assertEqual(len(self.repo._timeline), 2)
+        self.assertCountEqual(self.repo.find_by_status("pending"), [first, second])
+        self.assertEqual(self.repo.find_by_channel_and_period("KanalY", "2025-01"), [second])
+        self.assertIn("2 INSERT, 1 UPDATE", self.repo.get_audit_logs(1)[0])
+
+    def test_bulk_save_accepts_up_to_capacity_like_single_saves(self):
+        self.repo._MAX_CAPACITY = 3
+        existing = [_sponsor(), _sponsor()]
+        self.repo.save_bulk(existing)
+        batch = [existing[0], _sponsor(), _sponsor(), existing[1]]
+
+        stored = self.repo.save_bulk(batch)
+
+        self.assertEqual(stored, [True, True, False, False])
+        self.assertEqual(self.repo.get_payment_count(), 3)
+        self.assertIsNone(self.repo.find_by_id(batch[2].payment_id))
+
+    def test_failed_bulk_save_leaves_repository_untouched(self):
+        good, broken = _sponsor(), _BrokenPeriodPayment("KanalX", 10.0, "TRY", "2025-01", "S", "CNT-2")
+
+        with self.assertRaises(RuntimeError):
+            self.repo.save_bulk([good, broken])
+
+        self.assertEqual(self.repo.get_payment_count(), 0)
+        self.assertEqual(self.repo.get_status_distribution(), {})
+        self.assertEqual(self.repo.get_total_volume(), 0.0)
+        self.assertEqual(self.repo._timeline, [])
+        self.assertEqual(good._observers, [])
+
+    def test_bulk_save_rejects_non_payments_before_storing(self):
+        with self.assertRaises(TypeError):
+            self.repo.save_bulk([_sponsor(), object()])
+        self.assertEqual(self.repo.get_payment_count(), 0)
+
+
+class UpdateStatusBulkTests(unittest.TestCase):
+
+    def test_updates_known_ids_with_one_audit_record(self):
+        repo = InMemoryPaymentRepository()
+        payments = [_sponsor(), _sponsor()]
+        repo.save_bulk(payments)
+
+        updated = repo.update_status_bulk([payments[0].payment_id, "yok", payments[1].payment_id], "completed")
+
+        self.assertEqual(updated, payments)
+        self.assertEqual(repo.get_status_distribution(), {"completed": 2})
+        self.assertEqual(sum("[STATUS]" in line for line in repo.get_audit_logs(10)), 1)
+
+
+class ConsoleBufferTests(unittest.TestCase):
+
+    def test_console_buffer_flushes_at_threshold(self):
+        repo = InMemoryPaymentRepository()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for _ in range(repo._CONSOLE_FLUSH_THRESHOLD + 5):
+                repo.save(_sponsor())
+
+        self.assertEqual(out.getvalue().count("[DB LOG]"), repo._CONSOLE_FLUSH_THRESHOLD)
+        self.assertEqual(len(repo._pending_console), 5)
+
+
+class CurrencyValidationTests(unittest.TestCase):
+
+    def test_accepts_canonical_and_unnormalised_codes(self):
+        self.assertTrue(InMemoryPaymentRepository.validate_currency_code("USD"))
+        self.assertTrue(InMemoryPaymentRepository.validate_currency_code(" usd "))
+
+    def test_rejects_unknown_and_non_string_codes(self):
+        self.assertFalse(InMemoryPaymentRepository.validate_currency_code("XXX"))
+        self.assertFalse(InMemoryPaymentRepository.validate_currency_code(["USD"]))
+        self.assertFalse(InMemoryPaymentRepository.validate_currency_code(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
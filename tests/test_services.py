@@ -0,0 +1,206 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from revenue.implementations import AdRevenuePayment, SponsorshipPayment
+from revenue.repository import InMemoryPaymentRepository
+from revenue.services import AnalyticsService, RevenueService
+
+
+def _ad(channel="KanalY", amount=1500.0, period="2025-01"):
+    return AdRevenuePayment(channel, amount, "TRY", period, 100000, 15.0, "Google AdSense")
+
+
+def _sponsor(channel="KanalX", amount=50.0, period="2025-01"):
+    return SponsorshipPayment(channel, amount, "TRY", period, "Sponsor", "CNT-1")
+
+
+class HoldLowPaymentsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+
+    def _hold(self, threshold):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.service.hold_low_payments(threshold)
+
+    def test_completed_payment_is_not_held(self):
+        payment = _sponsor()
+        self.service.create_payment_record(payment)
+        payment.status = "completed"
+
+        self.assertEqual(self._hold(100), 0)
+        self.assertEqual(payment.status, "completed")
+
+    def test_payment_that_dropped_below_threshold_is_held(self):
+        payment = _ad()
+        self.service.create_payment_record(payment)
+        payment.update_impressions(1000)
+
+        self.assertEqual(self._hold(100), 1)
+        self.assertEqual(payment.status, "on_hold")
+        self.assertEqual(self.repo.find_by_status("on_hold"), [payment])
+
+
+class TaxLiabilityTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+
+    def test_liability_follows_changes_after_save(self):
+        payment = _ad()
+        self.service.create_payment_record(payment)
+        payment.update_impressions(1000)
+
+        self.assertEqual(self.service.calculate_total_tax_liability([payment]), 2.65)
+
+    def test_liability_of_empty_list_is_float_zero(self):
+        self.assertIsInstance(self.service.calculate_total_tax_liability([]), float)
+
+
+
+class PeriodicReportTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+
+    def test_report_tax_follows_changes_after_save(self):
+        payment = _ad()
+        self.service.create_payment_record(payment)
+        payment.update_impressions(1000)
+
+        report = self.service.generate_periodic_report("KanalY", "2025-01")
+
+        self.assertEqual(report["total_estimated_tax"], 2.65)
+
+    def test_report_gross_and_breakdown_follow_changes_after_save(self):
+        payment = _ad()
+        self.service.create_payment_record(payment)
+        payment.update_impressions(1000)
+
+        report = self.service.generate_periodic_report("KanalY", "2025-01")
+
+        self.assertEqual(report["total_gross_income"], 14.7)
+        self.assertEqual(report["breakdown"]["AdRevenue"], 14.7)
+        self.assertEqual(report["net_income_projection"], 12.05)
+        self.assertEqual(report["transaction_count"], 1)
+
+    def test_report_for_unknown_bucket_is_empty(self):
+        report = self.service.generate_periodic_report("Yok", "2025-01")
+
+        self.assertEqual(report["total_gross_income"], 0.0)
+        self.assertEqual(report["transaction_count"], 0)
+        self.assertEqual(set(report["breakdown"]), {"AdRevenue", "Membership", "Sponsorship"})
+
+
+class BulkCreateTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+
+    def test_returns_per_payment_success_mask(self):
+        valid = _sponsor()
+        zero = _sponsor(amount=0.0)
+        bad_currency = SponsorshipPayment("KanalX", 10.0, "XYZ", "2025-01", "Sponsor", "CNT-1")
+
+        result = self.service.create_payment_records_bulk([valid, zero, bad_currency, object()])
+
+        self.assertEqual(result, [True, False, False, False])
+        self.assertEqual(self.repo.get_payment_count(), 1)
+        self.assertIs(self.repo.find_by_id(valid.payment_id), valid)
+
+    def test_matches_single_record_capacity_behaviour(self):
+        self.repo._MAX_CAPACITY = 2
+        payments = [_sponsor(), _sponsor(amount=0.0), _sponsor(), _sponsor()]
+
+        result = self.service.create_payment_records_bulk(payments)
+
+        self.assertEqual(result, [True, False, True, False])
+        self.assertEqual(self.repo.get_payment_count(), 2)
+
+
+class BulkStatusUpdateTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+        self.payments = [_sponsor(), _sponsor()]
+        self.service.create_payment_records_bulk(self.payments)
+
+    def test_counts_found_payments(self):
+        ids = [p.payment_id for p in self.payments] + ["yok"]
+
+        self.assertEqual(self.service.bulk_status_update(ids, "completed"), 2)
+        self.assertEqual(self.repo.get_status_distribution(), {"completed": 2})
+
+    def test_invalid_status_updates_nothing(self):
+        ids = [p.payment_id for p in self.payments]
+
+        self.assertEqual(self.service.bulk_status_update(ids, "bilinmeyen"), 0)
+        self.assertEqual(self.repo.get_status_distribution(), {"pending": 2})
+
+
+class BulkSimulationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryPaymentRepository()
+        self.service = RevenueService(self.repo)
+
+    def test_applies_single_payment_rules_per_id(self):
+        done = _sponsor()
+        large = _sponsor(amount=60000.0)
+        ok = _sponsor()
+        failing = _sponsor()
+        self.service.create_payment_records_bulk([done, large, ok, failing])
+        done.status = "completed"
+
+        with mock.patch("revenue.services.random.random", side_effect=[0.5, 0.1]):
+            results = self.service.simulate_payment_processing_bulk(
+                ["yok", done.payment_id, large.payment_id, ok.payment_id, failing.payment_id]
+            )
+
+        self.assertEqual(
+            [(r.success, r.message) for r in results],
+            [
+                (False, "Ödeme bulunamadı."),
+                (False, "Ödeme zaten tamamlanmış."),
+                (True, "İşlem manuel onay kuyruğuna alındı."),
+                (True, "Transfer başarılı."),
+                (False, "Transfer başarısız."),
+            ],
+        )
+        self.assertEqual([large.status, ok.status, failing.status], ["processing", "completed", "failed"])
+        self.assertEqual(
+            self.repo.get_status_distribution(), {"completed": 2, "processing": 1, "failed": 1}
+        )
+        self.assertEqual(sum("[STATUS]" in line for line in self.repo.get_audit_logs(10)), 3)
+
+
+class ComparePeriodsBulkTests(unittest.TestCase):
+
+    def test_growth_and_trend_codes(self):
+        growths, trends = AnalyticsService.compare_periods_bulk([0, 100, 100, 50], [5, 150, 50, 50])
+
+        self.assertEqual(growths, [None, 50.0, -50.0, 0.0])
+        self.assertEqual(trends, [2, 0, 1, 1])
+
+    def test_agrees_with_scalar_comparison(self):
+        growths, _ = AnalyticsService.compare_periods_bulk([200.0], [250.0])
+        text = AnalyticsService.compare_periods(
+            {"total_gross_income": 200.0}, {"total_gross_income": 250.0}
+        )
+
+        self.assertEqual(text, f"Büyüme Oranı: %{growths[0]:.2f} (+)")
+
+    def test_length_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            AnalyticsService.compare_periods_bulk([100.0, 200.0], [150.0])
+
+
+if __name__ == "__main__":
+    unittest.main()